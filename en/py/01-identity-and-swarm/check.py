@@ -4,91 +4,158 @@ Check script for Lesson 1: Identity and Basic Host
 Validates that the student's solution creates a libp2p host with identity.
 """
 
-import subprocess
+import mmap
+from functools import lru_cache
 import sys
 import os
 import re
-import base58
 
+# Compiled once at import so repeated check runs don't re-parse the patterns.
+# Patterns are bytes-mode so they can scan the mmap'd log without decoding it.
+# All three startup markers sit in one alternation so a single pass over the
+# log finds them instead of three independent scans.
+_STARTUP_RE = re.compile(
+    rb"(?P<startup>Starting Universal Connectivity Application)"
+    rb"|Local peer id: (?P<peer_id>[A-Za-z0-9]+)"
+    rb"|(?P<host>Host started with PeerId:)"
+)
+_NON_WS_RE = re.compile(rb"\S")
+
+# Source markers check_code_structure() looks for, combined into one
+# alternation (longest first, so overlapping markers match whole) and
+# found with a single scan of the student's code.
+_CODE_MARKERS = (
+    "trio",
+    "ed25519",
+    "base58",
+    "class LibP2PHost",
+    "async def main",
+    "Ed25519PrivateKey.generate()",
+    "base58.b58encode",
+)
+_CODE_MARKERS_RE = re.compile(
+    "|".join(re.escape(m) for m in sorted(_CODE_MARKERS, key=len, reverse=True))
+)
+
+_B58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# 256-entry digit table: base58 value per byte, 0xFF for invalid characters
+_B58_MAP = bytearray([0xFF]) * 256
+for _i, _c in enumerate(_B58_ALPHABET):
+    _B58_MAP[_c] = _i
+
+def _b58decode(peer_id_bytes):
+    """Decode a base58 string; raises ValueError on a non-alphabet byte.
+
+    Specialized replacement for the generic ``base58`` library: the only
+    caller validates fixed-size SHA256 peer IDs, so no alphabet dispatch
+    or input scrubbing is needed.
+    """
+    n = 0
+    for c in peer_id_bytes:
+        v = _B58_MAP[c]
+        if v == 0xFF:
+            raise ValueError(f"Invalid base58 character: {chr(c)!r}")
+        n = n * 58 + v
+    # Each leading '1' encodes a leading zero byte
+    pad = len(peer_id_bytes) - len(peer_id_bytes.lstrip(b"1"))
+    return b"\x00" * pad + n.to_bytes((n.bit_length() + 7) // 8, "big")
+
+@lru_cache(maxsize=128)
 def validate_peer_id(peer_id_str):
     """Validate that the peer ID string is a valid base58 format"""
     try:
-        # Try to decode the peer ID as base58
-        decoded = base58.b58decode(peer_id_str)
-        
-        # Should be 32 bytes (SHA256 hash length)
+        # Decode the peer ID as base58 - should be 32 bytes (SHA256 hash length).
+        # The digit table doubles as the charset check, so invalid characters
+        # are rejected by the decode itself.
+        decoded = _b58decode(peer_id_str.encode("ascii"))
         if len(decoded) != 32:
             return False, f"Invalid peer ID length. Expected 32 bytes, got {len(decoded)}: {peer_id_str}"
-        
-        # Check if it's a valid base58 string (no invalid characters)
-        re_encoded = base58.b58encode(decoded).decode('ascii')
-        if re_encoded != peer_id_str:
-            return False, f"Peer ID base58 encoding is inconsistent: {peer_id_str}"
-        
+
         return True, f"Valid peer ID format: {peer_id_str}"
-        
+
     except Exception as e:
         return False, f"Invalid peer ID format: {peer_id_str} - Error: {e}"
 
 def check_output():
     """Check the output log for expected content"""
-    if not os.path.exists("stdout.log"):
+    try:
+        # Open directly and let FileNotFoundError report a missing log; an
+        # up-front exists() check would just be an extra stat and a TOCTOU
+        # race. Map the file read-only so the regex engine scans the page
+        # cache directly instead of copying and decoding the whole file.
+        with open("stdout.log", "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                print("X stdout.log is empty - application may have failed to start")
+                return False
+            output = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with output:
+            print("i  Checking application output...")
+
+            if not _NON_WS_RE.search(output):
+                print("X stdout.log is empty - application may have failed to start")
+                return False
+
+            # Find all three startup markers in one sweep over the log
+            seen_startup = False
+            seen_host = False
+            peer_id_bytes = None
+            for m in _STARTUP_RE.finditer(output):
+                if m.group("startup") is not None:
+                    seen_startup = True
+                elif m.group("host") is not None:
+                    seen_host = True
+                elif peer_id_bytes is None:
+                    peer_id_bytes = m.group("peer_id")
+                if seen_startup and seen_host and peer_id_bytes is not None:
+                    break
+
+            # Check for startup message
+            if not seen_startup:
+                print("X Missing startup message. Expected: 'Starting Universal Connectivity Application...'")
+                print(f"i  Actual output: {repr(output[:200])}")
+                return False
+            print("v Found startup message")
+
+            # Check for peer ID output
+            if peer_id_bytes is None:
+                print("X Missing peer ID output. Expected format: 'Local peer id: <base58_string>'")
+                print(f"i  Actual output: {repr(output[:200])}")
+                return False
+
+            peer_id = peer_id_bytes.decode("ascii")
+
+            # Validate the peer ID format
+            valid, message = validate_peer_id(peer_id)
+            if not valid:
+                print(f"X {message}")
+                return False
+
+            print(f"v {message}")
+
+            # Check for host startup message
+            if not seen_host:
+                print("X Missing host startup message. Expected: 'Host started with PeerId: ...'")
+                print(f"i  Actual output: {repr(output[:200])}")
+                return False
+            print("v Found host startup message")
+
+            # Check that the application doesn't crash immediately.
+            # Three output lines means at least two interior newlines; two
+            # bounded find() calls confirm that without splitting the log
+            # into a list of line objects.
+            first_nl = output.find(b"\n")
+            if first_nl < 0 or output.find(b"\n", first_nl + 1, len(output) - 1) < 0:
+                print("X Application seems to have crashed immediately after startup")
+                print(f"i  Output: {repr(output[:200])}")
+                return False
+
+            print("v Application started successfully and generated valid peer identity")
+            return True
+
+    except FileNotFoundError:
         print("X Error: stdout.log file not found")
         return False
-    
-    try:
-        with open("stdout.log", "r") as f:
-            output = f.read()
-        
-        print("i  Checking application output...")
-        
-        if not output.strip():
-            print("X stdout.log is empty - application may have failed to start")
-            return False
-        
-        # Check for startup message
-        if "Starting Universal Connectivity Application" not in output:
-            print("X Missing startup message. Expected: 'Starting Universal Connectivity Application...'")
-            print(f"i  Actual output: {repr(output[:200])}")
-            return False
-        print("v Found startup message")
-        
-        # Check for peer ID output
-        peer_id_pattern = r"Local peer id: ([A-Za-z0-9]+)"
-        peer_id_match = re.search(peer_id_pattern, output)
-        
-        if not peer_id_match:
-            print("X Missing peer ID output. Expected format: 'Local peer id: <base58_string>'")
-            print(f"i  Actual output: {repr(output[:200])}")
-            return False
-        
-        peer_id = peer_id_match.group(1)
-        
-        # Validate the peer ID format
-        valid, message = validate_peer_id(peer_id)
-        if not valid:
-            print(f"X {message}")
-            return False
-        
-        print(f"v {message}")
-        
-        # Check for host startup message
-        if "Host started with PeerId:" not in output:
-            print("X Missing host startup message. Expected: 'Host started with PeerId: ...'")
-            print(f"i  Actual output: {repr(output[:200])}")
-            return False
-        print("v Found host startup message")
-        
-        # Check that the application doesn't crash immediately
-        lines = output.strip().split('\n')
-        if len(lines) < 3:
-            print("X Application seems to have crashed immediately after startup")
-            print(f"i  Output lines: {lines}")
-            return False
-        
-        print("v Application started successfully and generated valid peer identity")
-        return True
-        
     except Exception as e:
         print(f"X Error reading stdout.log: {e}")
         return False
@@ -96,54 +163,59 @@ def check_output():
 def check_code_structure():
     """Check if the code has the expected structure"""
     app_file = "app/main.py"
-    
-    if not os.path.exists(app_file):
-        print("X Error: app/main.py file not found")
-        return False
-    
+
     try:
         with open(app_file, "r") as f:
             code = f.read()
         
         print("i  Checking code structure...")
-        
+
+        # Locate every marker with one scan instead of a full-file
+        # substring search per marker
+        found = {m.group(0) for m in _CODE_MARKERS_RE.finditer(code)}
+
+        def has_marker(marker):
+            # A longer matched token can contain a shorter marker
+            # (e.g. "base58.b58encode" also satisfies "base58")
+            return marker in found or any(marker in f for f in found)
+
         # Check for required imports
         required_imports = [
             "trio",
             "ed25519",
             "base58"
         ]
-        
+
         for imp in required_imports:
-            if imp not in code:
+            if not has_marker(imp):
                 print(f"X Missing import: {imp}")
                 return False
         print("v Required imports found")
-        
+
         # Check for LibP2PHost class
-        if "class LibP2PHost" not in code:
+        if not has_marker("class LibP2PHost"):
             print("X Missing LibP2PHost class definition")
             return False
         print("v LibP2PHost class found")
-        
+
         # Check for async main function
-        if "async def main" not in code:
+        if not has_marker("async def main"):
             print("X Missing async main function")
             return False
         print("v Async main function found")
-        
+
         # Check for key generation
-        if "Ed25519PrivateKey.generate()" not in code:
+        if not has_marker("Ed25519PrivateKey.generate()"):
             print("X Missing Ed25519 key generation")
             return False
         print("v Ed25519 key generation found")
-        
+
         # Check for PeerId creation
-        if "base58.b58encode" not in code:
+        if not has_marker("base58.b58encode"):
             print("X Missing PeerId base58 encoding")
             return False
         print("v PeerId creation found")
-        
+
         print("v Code structure is correct")
         return True
         
@@ -165,14 +237,17 @@ def main():
         if not check_output():
             return False
         
-        print("=" * 60)
-        print("All checks passed! Your libp2p host is working correctly.")
-        print("v You have successfully:")
-        print("   * Created a libp2p host with a stable Ed25519 identity")
-        print("   * Generated and displayed a valid peer ID")
-        print("   * Set up a basic async event loop")
-        print("   * Implemented proper host lifecycle management")
-        print("\nReady for Lesson 2: Transport and Multiaddrs!")
+        # One buffered write for the banner instead of a print() per line
+        sys.stdout.write(
+            "=" * 60 + "\n"
+            "All checks passed! Your libp2p host is working correctly.\n"
+            "v You have successfully:\n"
+            "   * Created a libp2p host with a stable Ed25519 identity\n"
+            "   * Generated and displayed a valid peer ID\n"
+            "   * Set up a basic async event loop\n"
+            "   * Implemented proper host lifecycle management\n"
+            "\nReady for Lesson 2: Transport and Multiaddrs!\n"
+        )
         
         return True
         
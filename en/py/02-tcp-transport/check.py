@@ -3,10 +3,27 @@
 Check script for Lesson 2: TCP Transport (Python)
 Validates that the student's py-libp2p solution can connect and handle connections.
 """
+import mmap
+from functools import lru_cache
 import os
 import re
 import sys
 
+# Patterns compiled once at import instead of on every check_output() call.
+# Bytes-mode so they can scan the mmap'd log without decoding it first.
+# The peer-ID fragment is defined once and spliced into each event pattern
+# so the character class cannot drift between them.
+_PEER_FRAG = rb"12D3KooW[A-Za-z0-9]+"
+_INCOMING_RE = re.compile(rb"incoming,([/\w\.:-]+),listening")
+_CONNECTED_RE = re.compile(rb"connected,(" + _PEER_FRAG + rb"),\(['\"]([^'\"]+)['\"],\s*(\d+)\)")
+_CLOSED_RE = re.compile(rb"closed,(" + _PEER_FRAG + rb")")
+_NON_WS_RE = re.compile(rb"\S")
+
+# Delete-table of every base58 character: translate() strips the valid
+# chars in one C call, so anything left over is an invalid character
+_B58_DELETE = str.maketrans("", "", "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+
+@lru_cache(maxsize=128)
 def validate_peer_id(peer_id_str):
     """Validate that the peer ID string is a valid libp2p PeerId format"""
     # Basic format validation - should start with 12D3KooW (Ed25519 peer IDs)
@@ -18,17 +35,18 @@ def validate_peer_id(peer_id_str):
         return False, f"Peer ID length seems invalid. Expected 45-60 chars, got {len(peer_id_str)}: {peer_id_str}"
     
     # Character set validation - should only contain base58 characters
-    valid_chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-    for char in peer_id_str:
-        if char not in valid_chars:
-            return False, f"Invalid character '{char}' in peer ID. Must be base58 encoded."
-    
+    leftover = peer_id_str.translate(_B58_DELETE)
+    if leftover:
+        return False, f"Invalid character '{leftover[0]}' in peer ID. Must be base58 encoded."
+
     return True, f"{peer_id_str}"
 
+@lru_cache(maxsize=128)
 def validate_multiaddr(addr_str):
     """Validate that the address string looks like a valid multiaddr"""
     # Basic multiaddr validation - should start with /ip4/ or /ip6/
-    if not (addr_str.startswith("/ip4/") or addr_str.startswith("/ip6/")):
+    # (startswith takes a tuple, checking both prefixes in one call)
+    if not addr_str.startswith(("/ip4/", "/ip6/")):
         return False, f"Invalid multiaddr format: {addr_str}"
     
     # Should contain /tcp for TCP transport
@@ -39,78 +57,84 @@ def validate_multiaddr(addr_str):
 
 def check_output():
     """Check the output log for expected TCP transport functionality"""
-    if not os.path.exists("checker.log"):
-        print("✗ checker.log file not found")
-        return False
-    
     try:
-        with open("checker.log", "r") as f:
-            output = f.read()
-        
-        print("ℹ Checking TCP transport functionality...")
-        
-        if not output.strip():
-            print("✗ checker.log is empty - checker may have failed to start")
-            return False
+        # Map the log read-only so the regex engine scans the page cache
+        # directly instead of copying and decoding the whole file first
+        with open("checker.log", "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                print("✗ checker.log is empty - checker may have failed to start")
+                return False
+            output = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # A correct solution causes the checker to output a sequence of messages like:
-        # incoming,/ip4/172.16.16.17/tcp/9092,listening
-        # connected,12D3KooWC56YFhhdVtAuz6hGzhVwKu6SyYQ6qh4PMkTJawXVC8rE,('172.16.16.16', 41972)
-        # closed,12D3KooWC56YFhhdVtAuz6hGzhVwKu6SyYQ6qh4PMkTJawXVC8rE
-
-        # Check for incoming connection setup
-        incoming_pattern = r"incoming,([/\w\.:-]+),listening"
-        incoming_matches = re.search(incoming_pattern, output)
-        if not incoming_matches:
-            print("✗ No incoming connection listener setup detected")
-            print(f"ℹ Actual output: {repr(output)}")
-            return False
+        with output:
+            print("ℹ Checking TCP transport functionality...")
 
-        listen_addr = incoming_matches.group(1)
-        valid, addr_message = validate_multiaddr(listen_addr)
-        if not valid:
-            print(f"✗ {addr_message}")
-            return False
-        
-        print(f"✓ Checker listening on {addr_message}")
-
-        # Check for connection establishment
-        connected_pattern = r"connected,(12D3KooW[A-Za-z0-9]+),\(['\"]([^'\"]+)['\"],\s*(\d+)\)"
-        connected_matches = re.search(connected_pattern, output)
-        if not connected_matches:
-            print("✗ No connection established")
-            print(f"ℹ Actual output: {repr(output)}")
-            return False
+            if not _NON_WS_RE.search(output):
+                print("✗ checker.log is empty - checker may have failed to start")
+                return False
 
-        peer_id = connected_matches.group(1)
-        remote_ip = connected_matches.group(2)
-        remote_port = connected_matches.group(3)
-        
-        valid, peer_id_message = validate_peer_id(peer_id)
-        if not valid:
-            print(f"✗ {peer_id_message}")
-            return False
-        
-        print(f"✓ Connection established with {peer_id_message} from {remote_ip}:{remote_port}")
-
-        # Check for connection closure
-        closed_pattern = r"closed,(12D3KooW[A-Za-z0-9]+)"
-        closed_matches = re.search(closed_pattern, output)
-        if not closed_matches:
-            print("✗ Connection closure not detected")
-            print(f"ℹ Actual output: {repr(output)}")
-            return False
-        
-        closed_peer_id = closed_matches.group(1)
-        valid, closed_peer_message = validate_peer_id(closed_peer_id)
-        if not valid:
-            print(f"✗ {closed_peer_message}")
-            return False
-        
-        print(f"✓ Connection {closed_peer_message} closed gracefully")
+            # A correct solution causes the checker to output a sequence of messages like:
+            # incoming,/ip4/172.16.16.17/tcp/9092,listening
+            # connected,12D3KooWC56YFhhdVtAuz6hGzhVwKu6SyYQ6qh4PMkTJawXVC8rE,('172.16.16.16', 41972)
+            # closed,12D3KooWC56YFhhdVtAuz6hGzhVwKu6SyYQ6qh4PMkTJawXVC8rE
 
-        return True
-        
+            # Check for incoming connection setup
+            # (cheap literal prefilter: only run the regex when the anchor token exists)
+            pos = output.find(b"incoming,")
+            incoming_matches = _INCOMING_RE.match(output, pos) if pos >= 0 else None
+            if not incoming_matches:
+                print("✗ No incoming connection listener setup detected")
+                print(f"ℹ Actual output: {repr(output[:])}")
+                return False
+
+            listen_addr = incoming_matches.group(1).decode("ascii")
+            valid, addr_message = validate_multiaddr(listen_addr)
+            if not valid:
+                print(f"✗ {addr_message}")
+                return False
+
+            print(f"✓ Checker listening on {addr_message}")
+
+            # Check for connection establishment
+            pos = output.find(b"connected,")
+            connected_matches = _CONNECTED_RE.match(output, pos) if pos >= 0 else None
+            if not connected_matches:
+                print("✗ No connection established")
+                print(f"ℹ Actual output: {repr(output[:])}")
+                return False
+
+            peer_id = connected_matches.group(1).decode("ascii")
+            remote_ip = connected_matches.group(2).decode("ascii")
+            remote_port = connected_matches.group(3).decode("ascii")
+
+            valid, peer_id_message = validate_peer_id(peer_id)
+            if not valid:
+                print(f"✗ {peer_id_message}")
+                return False
+
+            print(f"✓ Connection established with {peer_id_message} from {remote_ip}:{remote_port}")
+
+            # Check for connection closure
+            pos = output.find(b"closed,")
+            closed_matches = _CLOSED_RE.match(output, pos) if pos >= 0 else None
+            if not closed_matches:
+                print("✗ Connection closure not detected")
+                print(f"ℹ Actual output: {repr(output[:])}")
+                return False
+
+            closed_peer_id = closed_matches.group(1).decode("ascii")
+            valid, closed_peer_message = validate_peer_id(closed_peer_id)
+            if not valid:
+                print(f"✗ {closed_peer_message}")
+                return False
+
+            print(f"✓ Connection {closed_peer_message} closed gracefully")
+
+            return True
+
+    except FileNotFoundError:
+        print("✗ checker.log file not found")
+        return False
     except Exception as e:
         print(f"✗ Error reading checker.log: {e}")
         return False
@@ -125,14 +149,17 @@ def main():
         if not check_output():
             return False
         
-        print("ℹ " + "=" * 50)
-        print("✓ TCP transport lesson completed successfully!")
-        print("ℹ You have successfully:")
-        print("ℹ • Configured TCP transport with Noise security")
-        print("ℹ • Established connections with remote peers")
-        print("ℹ • Handled connection events properly")
-        print("ℹ • Created a foundation for peer-to-peer communication")
-        print("ℹ Ready for Lesson 3: Ping Checkpoint!")
+        # One buffered write for the banner instead of a print() per line
+        sys.stdout.write(
+            "ℹ " + "=" * 50 + "\n"
+            "✓ TCP transport lesson completed successfully!\n"
+            "ℹ You have successfully:\n"
+            "ℹ • Configured TCP transport with Noise security\n"
+            "ℹ • Established connections with remote peers\n"
+            "ℹ • Handled connection events properly\n"
+            "ℹ • Created a foundation for peer-to-peer communication\n"
+            "ℹ Ready for Lesson 3: Ping Checkpoint!\n"
+        )
         
         return True
         
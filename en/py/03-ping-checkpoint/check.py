@@ -9,11 +9,40 @@ Validates that the student's solution (main.py) is:
 5. Handling streams correctly
 """
 
-import subprocess
+import mmap
+from functools import lru_cache
 import sys
 import os
 import re
 
+# Patterns compiled once at import instead of on every check_output() call.
+# Bytes-mode so they can scan the mmap'd log without decoding it first.
+_CONNECTED_RE = re.compile(rb"Connected to (Qm[1-9A-HJ-NP-Za-km-z]{44})")
+_PING_RX_RE = re.compile(rb"received ping from (Qm[1-9A-HJ-NP-Za-km-z]{44})")
+_PING_TX_RE = re.compile(rb"responded with pong to (Qm[1-9A-HJ-NP-Za-km-z]{44})")
+_PING_RTT_RE = re.compile(rb"ping: Success from (Qm[1-9A-HJ-NP-Za-km-z]{44}), RTT = (\d+\.\d+) ms")
+_CLOSED_RE = re.compile(rb"Closed ping stream from (Qm[1-9A-HJ-NP-Za-km-z]{44})")
+_NON_WS_RE = re.compile(rb"\S")
+
+# Events to collect while streaming the log line by line. Each entry is
+# (key, literal anchor, extraction pattern); the regex only runs on lines
+# where the cheap anchor test hits, and the scan stops once every event
+# has been seen.
+_LINE_EVENTS = (
+    ("noise", b"Security: Noise encryption enabled", None),
+    ("yamux", b"Multiplexing: Yamux enabled", None),
+    ("connected", b"Connected to ", _CONNECTED_RE),
+    ("ping_rx", b"received ping from ", _PING_RX_RE),
+    ("ping_tx", b"responded with pong to ", _PING_TX_RE),
+    ("ping_rtt", b"ping: Success from ", _PING_RTT_RE),
+    ("closed", b"Closed ping stream from ", _CLOSED_RE),
+)
+
+# Delete-table of every base58 character: translate() strips the valid
+# chars in one C call, so anything left over is an invalid character
+_B58_DELETE = str.maketrans("", "", "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+
+@lru_cache(maxsize=128)
 def validate_peer_id(peer_id_str):
     """Validate that the peer ID string is a valid 'Qm...' PeerId format"""
     
@@ -26,124 +55,143 @@ def validate_peer_id(peer_id_str):
         return False, f"Peer ID length is incorrect. Expected 46 chars for RSA key, got {len(peer_id_str)}: {peer_id_str}"
     
     # 3. Character set validation - should only contain base58 characters
-    valid_chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-    for char in peer_id_str:
-        if char not in valid_chars:
-            return False, f"Invalid character '{char}' in peer ID. Must be base58 encoded."
-    
+    leftover = peer_id_str.translate(_B58_DELETE)
+    if leftover:
+        return False, f"Invalid character '{leftover[0]}' in peer ID. Must be base58 encoded."
+
     return True, f"{peer_id_str}"
 
 def check_output():
     """Check the output log for expected ping functionality"""
-    if not os.path.exists("checker.log"):
-        print("x checker.log file not found")
-        return False
-    
     try:
-        with open("checker.log", "r") as f:
-            output = f.read()
-        
-        print("i Checking ping functionality...")
-        
-        if not output.strip():
-            print("x checker.log is empty - application may have failed to start")
-            return False
+        # Map the log read-only so the regex engine scans the page cache
+        # directly instead of copying and decoding the whole file first
+        with open("checker.log", "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                print("x checker.log is empty - application may have failed to start")
+                return False
+            output = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # --- Check Server Setup ---
-        
-        if not re.search(r"Security: Noise encryption enabled", output):
-            print("x Server did not report 'Security: Noise encryption enabled'")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        print("v Security: Noise encryption enabled")
+        with output:
+            print("i Checking ping functionality...")
 
-        if not re.search(r"Multiplexing: Yamux enabled", output):
-            print("x Server did not report 'Multiplexing: Yamux enabled'")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        print("v Multiplexing: Yamux enabled")
+            if not _NON_WS_RE.search(output):
+                print("x checker.log is empty - application may have failed to start")
+                return False
 
-        # --- Check Client Connection ---
-        
-        connected_pattern = r"Connected to (Qm[1-9A-HJ-NP-Za-km-z]{44})"
-        connected_matches = re.search(connected_pattern, output)
-        if not connected_matches:
-            print("x No client connection message 'Connected to ...' found")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        
-        client_peer_id = connected_matches.group(1)
-        valid, msg = validate_peer_id(client_peer_id)
-        if not valid:
-            print(f"x {msg}")
-            return False
-        print(f"v Client connected to peer: {client_peer_id}")
+            # Stream the log line by line, collecting the first hit for each
+            # expected event and bailing out of the scan once all are found.
+            # This avoids one full-log traversal per pattern.
+            events = {}
+            output.seek(0)
+            for line in iter(output.readline, b""):
+                for key, anchor, pattern in _LINE_EVENTS:
+                    if key in events or anchor not in line:
+                        continue
+                    if pattern is None:
+                        events[key] = True
+                    else:
+                        line_match = pattern.search(line)
+                        if line_match:
+                            events[key] = line_match
+                if len(events) == len(_LINE_EVENTS):
+                    break
 
-        # --- Check Server Ping Handling ---
-        
-        ping_rx_pattern = r"received ping from (Qm[1-9A-HJ-NP-Za-km-z]{44})"
-        ping_rx_matches = re.search(ping_rx_pattern, output)
-        if not ping_rx_matches:
-            print("x No server 'received ping from ...' message found")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        
-        server_rx_peer_id = ping_rx_matches.group(1)
-        valid, msg = validate_peer_id(server_rx_peer_id)
-        if not valid:
-            print(f"x {msg}")
-            return False
-        print(f"v Server received ping from: {server_rx_peer_id}")
+            # --- Check Server Setup ---
 
-        ping_tx_pattern = r"responded with pong to (Qm[1-9A-HJ-NP-Za-km-z]{44})"
-        ping_tx_matches = re.search(ping_tx_pattern, output)
-        if not ping_tx_matches:
-            print("x No server 'responded with pong to ...' message found")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        print("v Server responded with pong")
+            if "noise" not in events:
+                print("x Server did not report 'Security: Noise encryption enabled'")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+            print("v Security: Noise encryption enabled")
 
-        # --- Check Client Ping RTT ---
-        
-        ping_rtt_pattern = r"ping: Success from (Qm[1-9A-HJ-NP-Za-km-z]{44}), RTT = (\d+\.\d+) ms"
-        ping_rtt_matches = re.search(ping_rtt_pattern, output)
-        if not ping_rtt_matches:
-            print("x No client 'ping: Success from ...' message found")
-            print("i This means RTT calculation is missing or formatted incorrectly.")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        
-        client_rtt_peer_id = ping_rtt_matches.group(1)
-        rtt = ping_rtt_matches.group(2)
-        valid, msg = validate_peer_id(client_rtt_peer_id)
-        if not valid:
-            print(f"x {msg}")
-            return False
-        print(f"v Client reported ping success from {client_rtt_peer_id} with RTT = {rtt} ms")
+            if "yamux" not in events:
+                print("x Server did not report 'Multiplexing: Yamux enabled'")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+            print("v Multiplexing: Yamux enabled")
 
-        # --- Check Server Stream Closure ---
-        
-        closed_pattern = r"Closed ping stream from (Qm[1-9A-HJ-NP-Za-km-z]{44})"
-        closed_matches = re.search(closed_pattern, output)
-        if not closed_matches:
-            print("x No server 'Closed ping stream from ...' message found")
-            print("i This means the server handler is not closing the stream correctly.")
-            print(f"i Actual output: {repr(output)}")
-            return False
-        print("v Server stream closed gracefully")
+            # --- Check Client Connection ---
 
-        # --- Cross-Validation ---
-        if not (client_peer_id == client_rtt_peer_id):
-            print(f"x Mismatch: Client connected to {client_peer_id} but got ping from {client_rtt_peer_id}")
-            return False
-            
-        if not (server_rx_peer_id == ping_tx_matches.group(1) == closed_matches.group(1)):
-            print("x Mismatch: Server logs show different peer IDs for rx, tx, and close")
-            return False
-        
-        print("v Peer IDs are consistent across client and server logs")
-        return True
-        
+            connected_matches = events.get("connected")
+            if not connected_matches:
+                print("x No client connection message 'Connected to ...' found")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+
+            client_peer_id = connected_matches.group(1).decode("ascii")
+            valid, msg = validate_peer_id(client_peer_id)
+            if not valid:
+                print(f"x {msg}")
+                return False
+            print(f"v Client connected to peer: {client_peer_id}")
+
+            # --- Check Server Ping Handling ---
+
+            ping_rx_matches = events.get("ping_rx")
+            if not ping_rx_matches:
+                print("x No server 'received ping from ...' message found")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+
+            server_rx_peer_id = ping_rx_matches.group(1).decode("ascii")
+            valid, msg = validate_peer_id(server_rx_peer_id)
+            if not valid:
+                print(f"x {msg}")
+                return False
+            print(f"v Server received ping from: {server_rx_peer_id}")
+
+            ping_tx_matches = events.get("ping_tx")
+            if not ping_tx_matches:
+                print("x No server 'responded with pong to ...' message found")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+            ping_tx_peer_id = ping_tx_matches.group(1).decode("ascii")
+            print("v Server responded with pong")
+
+            # --- Check Client Ping RTT ---
+
+            ping_rtt_matches = events.get("ping_rtt")
+            if not ping_rtt_matches:
+                print("x No client 'ping: Success from ...' message found")
+                print("i This means RTT calculation is missing or formatted incorrectly.")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+
+            client_rtt_peer_id = ping_rtt_matches.group(1).decode("ascii")
+            rtt = ping_rtt_matches.group(2).decode("ascii")
+            valid, msg = validate_peer_id(client_rtt_peer_id)
+            if not valid:
+                print(f"x {msg}")
+                return False
+            print(f"v Client reported ping success from {client_rtt_peer_id} with RTT = {rtt} ms")
+
+            # --- Check Server Stream Closure ---
+
+            closed_matches = events.get("closed")
+            if not closed_matches:
+                print("x No server 'Closed ping stream from ...' message found")
+                print("i This means the server handler is not closing the stream correctly.")
+                print(f"i Actual output: {repr(output[:])}")
+                return False
+            closed_peer_id = closed_matches.group(1).decode("ascii")
+            print("v Server stream closed gracefully")
+
+            # --- Cross-Validation ---
+            if not (client_peer_id == client_rtt_peer_id):
+                print(f"x Mismatch: Client connected to {client_peer_id} but got ping from {client_rtt_peer_id}")
+                return False
+
+            if len({server_rx_peer_id, ping_tx_peer_id, closed_peer_id}) != 1:
+                print("x Mismatch: Server logs show different peer IDs for rx, tx, and close")
+                return False
+
+            print("v Peer IDs are consistent across client and server logs")
+            return True
+
+    except FileNotFoundError:
+        print("x checker.log file not found")
+        return False
     except Exception as e:
         print(f"x Error reading checker.log: {e}")
         return False
@@ -158,14 +206,17 @@ def main():
         if not check_output():
             return False
         
-        print("i " + "=" * 50)
-        print("y Ping checkpoint completed successfully! 🎉")
-        print("i You have successfully:")
-        print("i • Used Noise for security and Yamux for multiplexing")
-        print("i • Established a p2p connection")
-        print("i • Sent pings on a 1-second interval")
-        print("i • Measured and printed round-trip times (RTT)")
-        print("i • Handled streams correctly on the server")
+        # One buffered write for the banner instead of a print() per line
+        sys.stdout.write(
+            "i " + "=" * 50 + "\n"
+            "y Ping checkpoint completed successfully! 🎉\n"
+            "i You have successfully:\n"
+            "i • Used Noise for security and Yamux for multiplexing\n"
+            "i • Established a p2p connection\n"
+            "i • Sent pings on a 1-second interval\n"
+            "i • Measured and printed round-trip times (RTT)\n"
+            "i • Handled streams correctly on the server\n"
+        )
         
         return True
         
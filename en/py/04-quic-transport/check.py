@@ -3,26 +3,48 @@
 Check script for Lesson 4: QUIC Transport
 Validates that the student's solution can connect with QUIC and ping remote peers.
 """
+import mmap
+from functools import lru_cache
 import os
 import re
 import sys
 import time
 
+# Single alternation over all four event kinds so one finditer pass
+# collects everything instead of four separate full-log scans.
+# Bytes-mode so it can scan the mmap'd log without decoding it first.
+# The peer-ID fragment is defined once and spliced into each branch so the
+# character class cannot drift between them.
+_PEER_FRAG = rb"12D3KooW[A-Za-z0-9]+"
+_EVENTS_RE = re.compile(
+    rb"(?P<incoming>incoming,(?P<in_target>[/\w\.:-]+),(?P<in_from>[/\w\.:-]+))"
+    rb"|(?P<connected>connected,(?P<conn_peer>" + _PEER_FRAG + rb"),(?P<conn_addr>[/\w\.:-]+))"
+    rb"|(?P<ping>ping,(?P<ping_peer>" + _PEER_FRAG + rb"),(?P<ping_rtt>\d+\.?\d*)\s*ms)"
+    rb"|(?P<closed>closed,(?P<closed_peer>" + _PEER_FRAG + rb"))"
+)
+_NON_WS_RE = re.compile(rb"\S")
+
+# Delete-table of every base58 character: translate() strips the valid
+# chars in one C call, so anything left over is an invalid character
+_B58_DELETE = str.maketrans("", "", "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+
+@lru_cache(maxsize=128)
 def validate_peer_id(peer_id_str):
     """Validate that the peer ID string is a valid libp2p PeerId format"""
     if not peer_id_str.startswith("12D3KooW"):
         return False, f"Invalid peer ID format. Expected to start with '12D3KooW', got: {peer_id_str}"
     if len(peer_id_str) < 45 or len(peer_id_str) > 60:
         return False, f"Peer ID length seems invalid. Expected 45-60 chars, got {len(peer_id_str)}: {peer_id_str}"
-    valid_chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-    for char in peer_id_str:
-        if char not in valid_chars:
-            return False, f"Invalid character '{char}' in peer ID. Must be base58 encoded."
+    leftover = peer_id_str.translate(_B58_DELETE)
+    if leftover:
+        return False, f"Invalid character '{leftover[0]}' in peer ID. Must be base58 encoded."
     return True, peer_id_str
 
+@lru_cache(maxsize=128)
 def validate_multiaddr(addr_str):
     """Validate that the address string looks like a valid multiaddr"""
-    if not (addr_str.startswith("/ip4/") or addr_str.startswith("/ip6/")):
+    # startswith takes a tuple, checking both prefixes in one call
+    if not addr_str.startswith(("/ip4/", "/ip6/")):
         return False, f"Invalid multiaddr format: {addr_str}"
     if "/quic-v1" not in addr_str:
         return False, f"Missing QUIC transport in multiaddr (expected /quic-v1): {addr_str}"
@@ -34,111 +56,122 @@ def check_output():
     """Check the output log for expected QUIC transport functionality"""
     log_path = "checker.log"
     
-    # Check if log file exists
-    if not os.path.exists(log_path):
-        print(f"✗ {log_path} file not found")
-        print(f"ℹ️  Expected log file at: {os.path.abspath(log_path)}")
-        return False
-    
     try:
-        with open(log_path, "r") as f:
-            output = f.read()
-        
-        if not output.strip():
-            print(f"✗ {log_path} is empty - application may have failed to start")
-            return False
+        # Map the log read-only so the regex engine scans the page cache
+        # directly instead of copying and decoding the whole file first
+        with open(log_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                print(f"✗ {log_path} is empty - application may have failed to start")
+                return False
+            output = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        print(f"ℹ️  Log file contents ({len(output)} bytes):")
-        print("-" * 60)
-        print(output[:500])  # Print first 500 chars for debugging
-        if len(output) > 500:
-            print("... (truncated)")
-        print("-" * 60)
-
-        # Check for incoming dial
-        incoming_pattern = r"incoming,([/\w\.:-]+),([/\w\.:-]+)"
-        incoming_matches = re.search(incoming_pattern, output)
-        if not incoming_matches:
-            print("✗ No incoming dial received")
-            print("ℹ️  Expected pattern: incoming,<target_addr>,<from_addr>")
-            return False
-        
-        target_addr = incoming_matches.group(1)
-        from_addr = incoming_matches.group(2)
-        
-        valid, t_message = validate_multiaddr(target_addr)
-        if not valid:
-            print(f"✗ Invalid target address: {t_message}")
-            return False
-        
-        valid, f_message = validate_multiaddr(from_addr)
-        if not valid:
-            print(f"✗ Invalid from address: {f_message}")
-            return False
-        
-        print(f"✓ Incoming dial detected: {f_message} → {t_message}")
-
-        # Check for connection establishment
-        connected_pattern = r"connected,(12D3KooW[A-Za-z0-9]+),([/\w\.:-]+)"
-        connected_matches = re.search(connected_pattern, output)
-        if not connected_matches:
-            print("✗ No connection established")
-            print("ℹ️  Expected pattern: connected,<peer_id>,<addr>")
-            return False
-        
-        peer_id = connected_matches.group(1)
-        conn_addr = connected_matches.group(2)
-        
-        valid, peer_message = validate_peer_id(peer_id)
-        if not valid:
-            print(f"✗ {peer_message}")
-            return False
-        
-        valid, addr_message = validate_multiaddr(conn_addr)
-        if not valid:
-            print(f"✗ {addr_message}")
-            return False
-        
-        print(f"✓ Connection established with peer {peer_message}")
-        print(f"  Address: {addr_message}")
-
-        # Check for ping
-        ping_pattern = r"ping,(12D3KooW[A-Za-z0-9]+),(\d+\.?\d*)\s*ms"
-        ping_matches = re.search(ping_pattern, output)
-        if not ping_matches:
-            print("✗ No ping received")
-            print("ℹ️  Expected pattern: ping,<peer_id>,<rtt> ms")
-            return False
-        
-        ping_peer_id = ping_matches.group(1)
-        rtt = ping_matches.group(2)
-        
-        valid, peer_message = validate_peer_id(ping_peer_id)
-        if not valid:
-            print(f"✗ {peer_message}")
-            return False
-        
-        print(f"✓ Ping received from {peer_message}")
-        print(f"  RTT: {rtt} ms")
-
-        # Check for connection closure
-        closed_pattern = r"closed,(12D3KooW[A-Za-z0-9]+)"
-        closed_matches = re.search(closed_pattern, output)
-        if not closed_matches:
-            print("✗ Connection closure not detected")
-            print("ℹ️  Expected pattern: closed,<peer_id>")
-            return False
-        
-        closed_peer_id = closed_matches.group(1)
-        valid, peer_message = validate_peer_id(closed_peer_id)
-        if not valid:
-            print(f"✗ {peer_message}")
-            return False
-        
-        print(f"✓ Connection {peer_message} closed gracefully")
+        with output:
+            if not _NON_WS_RE.search(output):
+                print(f"✗ {log_path} is empty - application may have failed to start")
+                return False
 
-        return True
-        
+            print(f"ℹ️  Log file contents ({len(output)} bytes):")
+            print("-" * 60)
+            print(output[:500].decode("utf-8", errors="replace"))  # Print first 500 chars for debugging
+            if len(output) > 500:
+                print("... (truncated)")
+            print("-" * 60)
+
+            # Collect all four event kinds in a single pass over the log,
+            # keeping the first occurrence of each (as re.search would)
+            events = {}
+            for m in _EVENTS_RE.finditer(output):
+                for kind in ("incoming", "connected", "ping", "closed"):
+                    if m.group(kind) is not None:
+                        events.setdefault(kind, m)
+                        break
+                if len(events) == 4:
+                    break
+
+            # Check for incoming dial
+            incoming_matches = events.get("incoming")
+            if not incoming_matches:
+                print("✗ No incoming dial received")
+                print("ℹ️  Expected pattern: incoming,<target_addr>,<from_addr>")
+                return False
+
+            target_addr = incoming_matches.group("in_target").decode("ascii")
+            from_addr = incoming_matches.group("in_from").decode("ascii")
+
+            valid, t_message = validate_multiaddr(target_addr)
+            if not valid:
+                print(f"✗ Invalid target address: {t_message}")
+                return False
+
+            valid, f_message = validate_multiaddr(from_addr)
+            if not valid:
+                print(f"✗ Invalid from address: {f_message}")
+                return False
+
+            print(f"✓ Incoming dial detected: {f_message} → {t_message}")
+
+            # Check for connection establishment
+            connected_matches = events.get("connected")
+            if not connected_matches:
+                print("✗ No connection established")
+                print("ℹ️  Expected pattern: connected,<peer_id>,<addr>")
+                return False
+
+            peer_id = connected_matches.group("conn_peer").decode("ascii")
+            conn_addr = connected_matches.group("conn_addr").decode("ascii")
+
+            valid, peer_message = validate_peer_id(peer_id)
+            if not valid:
+                print(f"✗ {peer_message}")
+                return False
+
+            valid, addr_message = validate_multiaddr(conn_addr)
+            if not valid:
+                print(f"✗ {addr_message}")
+                return False
+
+            print(f"✓ Connection established with peer {peer_message}")
+            print(f"  Address: {addr_message}")
+
+            # Check for ping
+            ping_matches = events.get("ping")
+            if not ping_matches:
+                print("✗ No ping received")
+                print("ℹ️  Expected pattern: ping,<peer_id>,<rtt> ms")
+                return False
+
+            ping_peer_id = ping_matches.group("ping_peer").decode("ascii")
+            rtt = ping_matches.group("ping_rtt").decode("ascii")
+
+            valid, peer_message = validate_peer_id(ping_peer_id)
+            if not valid:
+                print(f"✗ {peer_message}")
+                return False
+
+            print(f"✓ Ping received from {peer_message}")
+            print(f"  RTT: {rtt} ms")
+
+            # Check for connection closure
+            closed_matches = events.get("closed")
+            if not closed_matches:
+                print("✗ Connection closure not detected")
+                print("ℹ️  Expected pattern: closed,<peer_id>")
+                return False
+
+            closed_peer_id = closed_matches.group("closed_peer").decode("ascii")
+            valid, peer_message = validate_peer_id(closed_peer_id)
+            if not valid:
+                print(f"✗ {peer_message}")
+                return False
+
+            print(f"✓ Connection {peer_message} closed gracefully")
+
+            return True
+
+    except FileNotFoundError:
+        print(f"✗ {log_path} file not found")
+        print(f"ℹ️  Expected log file at: {os.path.abspath(log_path)}")
+        return False
     except Exception as e:
         print(f"✗ Error reading {log_path}: {e}")
         import traceback
@@ -163,15 +196,18 @@ def main():
             print("4. Confirm ping protocol is working")
             return False
         
-        print("\n" + "=" * 60)
-        print("✅ QUIC Transport completed successfully! 🎉")
-        print("=" * 60)
-        print("\nYou have successfully:")
-        print("  • Configured QUIC transport")
-        print("  • Established bidirectional connectivity")
-        print("  • Measured round-trip times between peers")
-        print("  • Gracefully closed connections")
-        print("\n🎓 Ready for Lesson 5: Identify Checkpoint!")
+        # One buffered write for the banner instead of a print() per line
+        sys.stdout.write(
+            "\n" + "=" * 60 + "\n"
+            "✅ QUIC Transport completed successfully! 🎉\n"
+            + "=" * 60 + "\n"
+            "\nYou have successfully:\n"
+            "  • Configured QUIC transport\n"
+            "  • Established bidirectional connectivity\n"
+            "  • Measured round-trip times between peers\n"
+            "  • Gracefully closed connections\n"
+            "\n🎓 Ready for Lesson 5: Identify Checkpoint!\n"
+        )
         return True
         
     except Exception as e:
@@ -3,12 +3,26 @@
 Check script for the Universal Connectivity Program (Identify Checkpoint)
 Validates that the program's output shows it can connect, identify, and ping remote peers.
 """
+import mmap
 import os
 import re
 import sys
 
-# Regex to capture a standard libp2p PeerID
-PEER_ID_REGEX = r"(12D3KooW[A-Za-z0-9]+)"
+# All six expected events combined into one alternation so a single
+# finditer pass over the log collects everything, instead of six separate
+# full-log scans. The peer-specific branches capture the peer ID so it can
+# be compared against the one from the connection line. Bytes-mode so the
+# pattern can scan the mmap'd log without decoding it first.
+_PEER_FRAG = rb"12D3KooW[A-Za-z0-9]+"
+EVENTS_RE = re.compile(
+    rb"(?P<conn>Connected to: (?P<conn_peer>" + _PEER_FRAG + rb"))"
+    rb"|(?P<sent>\[IDENTIFY\] Sending identify request to (?P<sent_peer>" + _PEER_FRAG + rb"))"
+    rb"|(?P<recv>\[IDENTIFY\] Identified peer: (?P<recv_peer>" + _PEER_FRAG + rb"))"
+    rb"|(?P<agent>\[IDENTIFY\] Agent: (?P<agent_ver>[\w\./-]+))"
+    rb"|(?P<proto>\[IDENTIFY\] Protocol version: (?P<proto_ver>[\w\./-]+))"
+    rb"|(?P<ping>\[PING\] Ping to (?P<ping_peer>" + _PEER_FRAG + rb"): RTT [\d\.]+ms)"
+)
+_NON_WS_RE = re.compile(rb"\S")
 
 def check_output():
     """Check the output log for expected identify checkpoint functionality"""
@@ -21,77 +35,92 @@ def check_output():
         return False
     
     try:
-        with open("checker.log", "r") as f:
-            output = f.read()
-        print("i Checking identify functionality...")
+        # Map the log read-only so the regex engine scans the page cache
+        # directly instead of copying and decoding the whole file first
+        with open("checker.log", "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                print("! checker.log is empty - application may have failed to start")
+                return False
+            output = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # 2. Check if the log is empty
-        if not output.strip():
-            print("! checker.log is empty - application may have failed to start")
-            return False
-        
-        # 3. Check for successful connection
-        # Looks for: "...Connected to: 12D3Koo..."
-        connected_pattern = re.compile(r"Connected to: " + PEER_ID_REGEX)
-        connected_match = connected_pattern.search(output)
+        with output:
+            print("i Checking identify functionality...")
+
+            # 2. Check if the log is empty
+            if not _NON_WS_RE.search(output):
+                print("! checker.log is empty - application may have failed to start")
+                return False
+
+            # Collect all six event kinds in a single pass over the log,
+            # keeping the first occurrence of each (as re.search would)
+            events = {}
+            for m in EVENTS_RE.finditer(output):
+                for kind in ("conn", "sent", "recv", "agent", "proto", "ping"):
+                    if m.group(kind) is not None:
+                        events.setdefault(kind, m)
+                        break
+                if len(events) == 6:
+                    break
+
+            # 3. Check for successful connection
+            # Looks for: "...Connected to: 12D3Koo..."
+            connected_match = events.get("conn")
         
-        if not connected_match:
-            print("! No successful connection message found (e.g., 'Connected to: ...')")
-            print(f"i Actual output (first 500 chars): {repr(output[:500])}...")
-            return False
+            if not connected_match:
+                print("! No successful connection message found (e.g., 'Connected to: ...')")
+                print(f"i Actual output (first 500 chars): {repr(output[:500])}...")
+                return False
         
-        peer_id = connected_match.group(1)
-        print(f"v Connection established with peer: {peer_id}")
-
-        # 4. Check for sending identify request
-        # Looks for: "[IDENTIFY] Sending identify request to 12D3Koo..."
-        identify_sent_pattern = re.compile(r"\[IDENTIFY\] Sending identify request to " + re.escape(peer_id))
-        if not identify_sent_pattern.search(output):
-            print(f"! Did not find message for sending identify request to {peer_id}")
-            return False
+            peer_id = connected_match.group("conn_peer").decode("ascii")
+            print(f"v Connection established with peer: {peer_id}")
+
+            # 4. Check for sending identify request
+            # Looks for: "[IDENTIFY] Sending identify request to 12D3Koo..."
+            identify_sent_match = events.get("sent")
+            if not identify_sent_match or identify_sent_match.group("sent_peer").decode("ascii") != peer_id:
+                print(f"! Did not find message for sending identify request to {peer_id}")
+                return False
         
-        print(f"v Sent identify request to {peer_id}")
+            print(f"v Sent identify request to {peer_id}")
 
-        # 5. Check for receiving identify response
-        # Looks for: "[IDENTIFY] Identified peer: 12D3Koo..."
-        identify_recv_pattern = re.compile(r"\[IDENTIFY\] Identified peer: " + re.escape(peer_id))
-        if not identify_recv_pattern.search(output):
-            print(f"! Did not receive identify response from {peer_id}")
-            return False
+            # 5. Check for receiving identify response
+            # Looks for: "[IDENTIFY] Identified peer: 12D3Koo..."
+            identify_recv_match = events.get("recv")
+            if not identify_recv_match or identify_recv_match.group("recv_peer").decode("ascii") != peer_id:
+                print(f"! Did not receive identify response from {peer_id}")
+                return False
 
-        print(f"v Received identify response from {peer_id}")
+            print(f"v Received identify response from {peer_id}")
 
-        # 6. Check for agent version
-        # Looks for: "[IDENTIFY] Agent: universal-connectivity/0.1.0"
-        agent_pattern = re.compile(r"\[IDENTIFY\] Agent: ([\w\./-]+)")
-        agent_match = agent_pattern.search(output)
-        if not agent_match:
-            print(f"! Did not find agent version in identify response")
-            return False
+            # 6. Check for agent version
+            # Looks for: "[IDENTIFY] Agent: universal-connectivity/0.1.0"
+            agent_match = events.get("agent")
+            if not agent_match:
+                print(f"! Did not find agent version in identify response")
+                return False
         
-        print(f"v Identified remote agent: {agent_match.group(1)}")
-
-        # 7. Check for protocol version
-        # Looks for: "[IDENTIFY] Protocol version: /ipfs/0.1.0"
-        proto_ver_pattern = re.compile(r"\[IDENTIFY\] Protocol version: ([\w\./-]+)")
-        proto_ver_match = proto_ver_pattern.search(output)
-        if not proto_ver_match:
-            print(f"! Did not find protocol version in identify response")
-            return False
+            print(f"v Identified remote agent: {agent_match.group('agent_ver').decode('ascii')}")
+
+            # 7. Check for protocol version
+            # Looks for: "[IDENTIFY] Protocol version: /ipfs/0.1.0"
+            proto_ver_match = events.get("proto")
+            if not proto_ver_match:
+                print(f"! Did not find protocol version in identify response")
+                return False
         
-        print(f"v Identified remote protocol version: {proto_ver_match.group(1)}")
-
-        # 8. Check for at least one successful ping
-        # Looks for: "[PING] Ping to 12D3Koo...: RTT 12.34ms"
-        ping_pattern = re.compile(r"\[PING\] Ping to " + re.escape(peer_id) + r": RTT ([\d\.]+)ms")
-        if not ping_pattern.search(output):
-            print(f"w No successful ping message found for {peer_id}.")
-            # This is a warning, not a failure, as identify is the main goal.
-        else:
-            print(f"v Successful ping to {peer_id} detected.")
-
-        # If all checks passed
-        return True
+            print(f"v Identified remote protocol version: {proto_ver_match.group('proto_ver').decode('ascii')}")
+
+            # 8. Check for at least one successful ping
+            # Looks for: "[PING] Ping to 12D3Koo...: RTT 12.34ms"
+            ping_match = events.get("ping")
+            if not ping_match or ping_match.group("ping_peer").decode("ascii") != peer_id:
+                print(f"w No successful ping message found for {peer_id}.")
+                # This is a warning, not a failure, as identify is the main goal.
+            else:
+                print(f"v Successful ping to {peer_id} detected.")
+
+            # If all checks passed
+            return True
 
     except Exception as e:
         print(f"! Error reading or parsing checker.log: {e}")
@@ -8,6 +8,15 @@ import sys
 import os
 import re
 
+# Patterns compiled once at import instead of on every check_output() call.
+# The sender fragment in a chat line is the head of a base58 peer ID, so the
+# strict base58 class is embedded in the pattern: a match already implies a
+# structurally valid sender ID and no separate validation pass is needed.
+_B58_FRAG = r"[1-9A-HJ-NP-Za-km-z]{8,}"
+HOST_STARTED_RE = re.compile(r"Host started, listening on:")
+SUBSCRIBE_RE = re.compile(r"Subscribed to topics: .*universal-connectivity")
+MSG_RE = re.compile(rf"\[.+?\({_B58_FRAG}\)\]: .+")
+
 def check_output():
     """Check the output log for expected gossipsub checkpoint functionality"""
     
@@ -19,31 +28,49 @@ def check_output():
         return False
     
     try:
-        with open("checker.log", "r") as f:
-            output = f.read()
-        
         print("i Checking gossipsub checkpoint functionality...")
-        
+
+        # Stream the log one line at a time instead of reading the whole file
+        # into memory, and stop scanning once every expected event has been
+        # seen. Only the first 500 chars are kept for the diagnostic output.
+        host_started = False
+        subscribed = False
+        msg_match = None
+        empty = True
+        head = ""
+        with open("checker.log", "r", buffering=1 << 16) as f:
+            for line in f:
+                if len(head) < 500:
+                    head += line
+                if empty and line.strip():
+                    empty = False
+                if not host_started and HOST_STARTED_RE.search(line):
+                    host_started = True
+                elif not subscribed and SUBSCRIBE_RE.search(line):
+                    subscribed = True
+                elif msg_match is None:
+                    msg_match = MSG_RE.search(line)
+                if host_started and subscribed and msg_match:
+                    break
+
         # 2. Check if the log is empty
-        if not output.strip():
+        if empty:
             print("! checker.log is empty - application may have failed to start")
             return False
 
         # 3. Check if the host started
         # Looks for: "Host started, listening on: ..." (from logger.info)
-        host_started_pattern = re.compile(r"Host started, listening on:")
-        if not host_started_pattern.search(output):
+        if not host_started:
             print("! Host start message not found.")
             print("i Make sure you are running with --verbose to capture info logs.")
-            print(f"i Actual output (first 500 chars): {repr(output[:500])}...")
+            print(f"i Actual output (first 500 chars): {repr(head[:500])}...")
             return False
-            
+
         print("v Host started successfully.")
 
         # 4. Check for Gossipsub subscription
         # Looks for: "Subscribed to topics: universal-connectivity, ..." (from logger.info)
-        subscribe_pattern = re.compile(r"Subscribed to topics: .*universal-connectivity")
-        if not subscribe_pattern.search(output):
+        if not subscribed:
             print("! Did not find subscription message for 'universal-connectivity'.")
             print("i Make sure you are running with --verbose to capture info logs.")
             return False
@@ -51,9 +78,6 @@ def check_output():
         print("v Subscribed to 'universal-connectivity' topic.")
 
         # 5. Check for a received chat message
-        msg_pattern = re.compile(r"\[.+?\([A-Za-z0-9]{8,}\)\]: .+")
-        msg_match = msg_pattern.search(output)
-        
         if not msg_match:
             print("! No incoming chat message was found in the log.")
             print("i Make sure another peer connects and sends a message.")
@@ -5,28 +5,71 @@ Validates that the student's solution can run DHT nodes in both server and clien
 (ASCII-safe version)
 """
 
+import hashlib
+import json
+import mmap
 import os
 import re
 import sys
 
+# Cached check result keyed by a fingerprint of the logs, so re-running
+# the checker against unchanged logs skips the regex scan entirely
+_CACHE_FILE = ".check_cache.json"
+
+# Logs are read from $DHT_LOG_DIR when set - run_test.py points it at a
+# tmpfs directory so log bytes stay in RAM - and from the working
+# directory otherwise. Note run_test.py removes its tmpfs directory on
+# exit, so a standalone run afterwards scans whatever logs sit in the
+# working directory; main() prints the directory in use to make that
+# visible.
+_LOG_DIR = os.environ.get("DHT_LOG_DIR", ".")
+_LOG_TYPES = ("server", "client", "checker")
+_LOG_NAMES = tuple(os.path.join(_LOG_DIR, f"{t}.log") for t in _LOG_TYPES)
+
+# Delete-table of every base58 character: translate() strips the valid
+# chars in one C call, so anything left over is an invalid character
+_B58_DELETE = str.maketrans("", "", "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+
+# Accepted peer-ID prefixes; startswith takes the tuple directly so the
+# prefix test runs in C instead of a generator over the list
+_VALID_PREFIXES = ("12D3KooW", "16Uiu2HAm")
+
+# All four event families fused into one alternation so a single finditer
+# pass per log collects everything, instead of one full scan per pattern.
+# Compiled once at import, bytes-mode so it can scan the mmap'd logs
+# without decoding them first.
+EVENTS_RE = re.compile(
+    rb"(?P<server>DHT service started in server mode"
+    rb"|checker-dht-started,server"
+    rb"|Running in server mode)"
+    rb"|(?P<stored>Stored value '(?P<stored_value>[^']+)' with key: (?P<stored_key>[A-Za-z0-9]+)"
+    rb"|dht-put,(?P<put_key>[A-Za-z0-9]+),(?P<put_value>[^,\n]+))"
+    rb"|(?P<retrieved>Retrieved value: [^,\n]+"
+    rb"|dht-get,[A-Za-z0-9]+,[^,\n]+)"
+    rb"|(?P<conn>connected,(?P<conn_peer>(?:12D3KooW|16Uiu2HAm)[A-Za-z0-9]+),(?P<conn_addr>[/\w\.:-]+)"
+    rb"|Connected to bootstrap nodes: \[(?P<boot_peers>[^\]]+)\]"
+    rb"|connections-established,(?P<conn_count>\d+))"
+)
+_EVENT_KINDS = ("server", "stored", "retrieved", "conn")
+
+_NON_WS_RE = re.compile(rb"\S")
+
 
 def validate_peer_id(peer_id_str):
     """Validate that the peer ID string is a valid libp2p PeerId format"""
     # Basic format validation - can start with 12D3KooW (Ed25519) or 16Uiu2HAm (secp256k1)
-    valid_prefixes = ["12D3KooW", "16Uiu2HAm"]
-    if not any(peer_id_str.startswith(prefix) for prefix in valid_prefixes):
-        return False, f"Invalid peer ID format. Expected to start with one of {valid_prefixes}, got: {peer_id_str}"
-    
+    if not peer_id_str.startswith(_VALID_PREFIXES):
+        return False, f"Invalid peer ID format. Expected to start with one of {list(_VALID_PREFIXES)}, got: {peer_id_str}"
+
     # Length check - valid peer IDs should be around 45-60 characters
     if len(peer_id_str) < 45 or len(peer_id_str) > 60:
         return False, f"Peer ID length seems invalid. Expected 45-60 chars, got {len(peer_id_str)}: {peer_id_str}"
-    
+
     # Character set validation - should only contain base58 characters
-    valid_chars = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-    for char in peer_id_str:
-        if char not in valid_chars:
-            return False, f"Invalid character '{char}' in peer ID. Must be base58 encoded."
-    
+    leftover = peer_id_str.translate(_B58_DELETE)
+    if leftover:
+        return False, f"Invalid character '{leftover[0]}' in peer ID. Must be base58 encoded."
+
     return True, f"Valid peer ID format: {peer_id_str}"
 
 
@@ -43,130 +86,145 @@ def validate_multiaddr(addr_str):
     return True, f"Valid multiaddr: {addr_str}"
 
 
+def _logs_fingerprint():
+    """Hash the size and mtime of each log into one cache key.
+
+    Any new run rewrites the logs and bumps their mtime, so invalidation
+    is automatic; stat is enough and no log bytes need to be read.
+    """
+    digest = hashlib.sha256()
+    for log_name in _LOG_NAMES:
+        try:
+            st = os.stat(log_name)
+            digest.update(f"{log_name}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{log_name}:absent;".encode())
+    return digest.hexdigest()
+
+
+def load_cached_result(key):
+    """Return the cached check result for this key, or None on any miss"""
+    try:
+        with open(_CACHE_FILE) as f:
+            cached = json.load(f)
+        result = cached.get(key)
+        return result if isinstance(result, bool) else None
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_result(key, result):
+    """Persist the check result for this key (best effort)"""
+    try:
+        with open(_CACHE_FILE, "w") as f:
+            json.dump({key: result}, f)
+    except OSError:
+        pass
+
+
 def check_output():
     """Check the output log for expected kademlia DHT functionality"""
+    mmaps = []
     try:
         # Check both server and client logs, and checker log
-        log_files = []
-        
-        if os.path.exists("server.log"):
-            log_files.append(("server.log", "server"))
-        if os.path.exists("client.log"):
-            log_files.append(("client.log", "client"))
-        if os.path.exists("checker.log"):
-            log_files.append(("checker.log", "checker"))
-        
+        log_files = [(log_path, log_type)
+                     for log_path, log_type in zip(_LOG_NAMES, _LOG_TYPES)
+                     if os.path.exists(log_path)]
+
         if not log_files:
             print("! No log files found (server.log, client.log, or checker.log)")
             return False
         
         print("i Checking kademlia DHT functionality...")
         
-        all_output = ""
+        # Map each log read-only so the regex engine scans the page cache
+        # directly instead of concatenating every file into one big string
         for log_file, log_type in log_files:
             try:
-                with open(log_file, "r") as f:
-                    content = f.read()
-                    all_output += content + "\n"
-                    print(f"i Found {log_type} log with {len(content)} characters")
+                with open(log_file, "rb") as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        print(f"i Found {log_type} log with 0 characters")
+                        continue
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                mmaps.append((log_file, mm))
+                print(f"i Found {log_type} log with {len(mm)} characters")
             except Exception as e:
                 print(f"i Warning: Could not read {log_file}: {e}")
         
-        if not all_output.strip():
+        if not any(_NON_WS_RE.search(mm) for _, mm in mmaps):
             print("! All log files are empty - application may have failed to start")
             return False
         
-        print(f"i Combined output (first 200 chars): {repr(all_output[:200])}...")
+        head = b"".join(mm[:200] for _, mm in mmaps)[:200]
+        print(f"i Combined output (first 200 chars): {repr(head)}...")
         
-        # Check for server node startup
-        server_start_patterns = [
-            r"DHT service started in server mode",
-            r"checker-dht-started,server",
-            r"Running in server mode"
-        ]
-        
-        server_started = False
-        for pattern in server_start_patterns:
-            if re.search(pattern, all_output):
-                server_started = True
-                print(f"v DHT server detected using pattern: {pattern}")
+        # Collect the first occurrence of each event family with one
+        # finditer pass per log, stopping as soon as all four are seen
+        events = {}
+        for _, mm in mmaps:
+            for m in EVENTS_RE.finditer(mm):
+                for kind in _EVENT_KINDS:
+                    if m.group(kind) is not None:
+                        events.setdefault(kind, m)
+                        break
+                if len(events) == len(_EVENT_KINDS):
+                    break
+            if len(events) == len(_EVENT_KINDS):
                 break
         
-        if not server_started:
+        # Check for server node startup
+        server_match = events.get("server")
+        server_started = server_match is not None
+        if server_started:
+            print(f"v DHT server detected using marker: {server_match.group('server').decode('ascii')}")
+        else:
             print("! DHT server mode not detected")
-            print(f"i Actual output: {repr(all_output)}")
+            for log_file, mm in mmaps:
+                print(f"i Actual {log_file} output: {repr(mm[:])}")
             return False
         
         # Check for value storage
-        value_stored_patterns = [
-            r"Stored value '([^']+)' with key: ([A-Za-z0-9]+)",
-            r"dht-put,([A-Za-z0-9]+),([^,\n]+)"
-        ]
-        
-        value_stored = False
-        for pattern in value_stored_patterns:
-            value_matches = re.search(pattern, all_output)
-            if value_matches:
-                if "dht-put" in pattern:
-                    stored_key = value_matches.group(1)
-                    stored_value = value_matches.group(2)
-                else:
-                    stored_value = value_matches.group(1)
-                    stored_key = value_matches.group(2)
-                print(f"v Value storage detected: '{stored_value}' with key: {stored_key}")
-                value_stored = True
-                break
-        
-        if not value_stored:
+        value_matches = events.get("stored")
+        value_stored = value_matches is not None
+        if value_stored:
+            if value_matches.group("put_key") is not None:
+                stored_key = value_matches.group("put_key").decode("utf-8", "replace")
+                stored_value = value_matches.group("put_value").decode("utf-8", "replace")
+            else:
+                stored_value = value_matches.group("stored_value").decode("utf-8", "replace")
+                stored_key = value_matches.group("stored_key").decode("utf-8", "replace")
+            print(f"v Value storage detected: '{stored_value}' with key: {stored_key}")
+        else:
             print("w No explicit value storage detected (client may have run first)")
         
         # Check for value retrieval
-        value_retrieved_patterns = [
-            r"Retrieved value: ([^,\n]+)",
-            r"dht-get,([A-Za-z0-9]+),([^,\n]+)"
-        ]
-        
-        value_retrieved = False
-        for pattern in value_retrieved_patterns:
-            if re.search(pattern, all_output):
-                print(f"v Value retrieval detected.")
-                value_retrieved = True
-                break
-        
-        if not value_retrieved:
+        value_retrieved = "retrieved" in events
+        if value_retrieved:
+            print(f"v Value retrieval detected.")
+        else:
              print("w No explicit value retrieval detected (server may have run standalone)")
 
         
         # Check for peer connections
-        connection_patterns = [
-            r"connected,([16D3KooW|16Uiu2HAm][A-Za-z0-9]+),([/\w\.:-]+)",
-            r"Connected to bootstrap nodes: \[([^\]]+)\]",
-            r"connections-established,(\d+)"
-        ]
-        
-        connections_found = False
-        for pattern in connection_patterns:
-            matches = re.search(pattern, all_output)
-            if matches:
-                connections_found = True
-                if "connections-established" in pattern:
-                    count = matches.group(1)
-                    print(f"v Peer connections established: {count}")
-                elif "Connected to bootstrap" in pattern:
-                    peers_str = matches.group(1)
-                    print(f"v Bootstrap connections: {peers_str}")
+        matches = events.get("conn")
+        connections_found = matches is not None
+        if connections_found:
+            if matches.group("conn_count") is not None:
+                count = matches.group("conn_count").decode("ascii")
+                print(f"v Peer connections established: {count}")
+            elif matches.group("boot_peers") is not None:
+                peers_str = matches.group("boot_peers").decode("utf-8", "replace")
+                print(f"v Bootstrap connections: {peers_str}")
+            else:
+                peer_id = matches.group("conn_peer").decode("ascii")
+                addr = matches.group("conn_addr").decode("utf-8", "replace")
+                valid_peer, peer_msg = validate_peer_id(peer_id)
+                if valid_peer:
+                    print(f"v Peer connection: {peer_id} at {addr}")
                 else:
-                    peer_id = matches.group(1)
-                    addr = matches.group(2)
-                    valid_peer, peer_msg = validate_peer_id(peer_id)
-                    if valid_peer:
-                        print(f"v Peer connection: {peer_id} at {addr}")
-                    else:
-                        print(f"! {peer_msg}")
-                        return False
-                break
-        
-        if not connections_found:
+                    print(f"! {peer_msg}")
+                    return False
+        else:
             print("i No explicit peer connections detected in logs (may be okay for server-only test)")
         
         # Summary of what we found
@@ -184,16 +242,34 @@ def check_output():
     except Exception as e:
         print(f"! Error reading log files: {e}")
         return False
+    finally:
+        for _, mm in mmaps:
+            mm.close()
 
 
 def main():
     """Main check function"""
     print("i Checking Kademlia DHT Implementation")
     print("i " + "=" * 50)
+    if _LOG_DIR != ".":
+        print(f"i Reading logs from DHT_LOG_DIR: {_LOG_DIR}")
     
     try:
-        # Check the output
-        if not check_output():
+        # Skip the log scan entirely when the logs are unchanged since the
+        # last run - the fingerprint is stat-based so a hit costs three
+        # stat calls and one small JSON read
+        # --verbose always re-runs the scan so the full report is printed
+        # even when a cached verdict for these logs exists; the flag only
+        # controls reporting, never the pass/fail verdict
+        key = _logs_fingerprint()
+        passed = None if "--verbose" in sys.argv[1:] else load_cached_result(key)
+        if passed is not None:
+            print(f"i Logs unchanged since last run - using cached result ({'pass' if passed else 'fail'})")
+        else:
+            passed = check_output()
+            store_cached_result(key, passed)
+
+        if not passed:
             print("i " + "=" * 50)
             print("! Kademlia DHT check failed.")
             return False
@@ -4,40 +4,135 @@ Test runner for Kademlia DHT Implementation
 This script orchestrates running the server, client, and checker
 """
 
+import contextlib
+import io
 import os
+import shutil
 import subprocess
 import sys
+import threading
 import time
 import signal
 from typing import Optional
 
+def _pick_log_dir() -> str:
+    """Pick a tmpfs-backed directory for the logs when one is available.
 
-def run_command_background(cmd: list, log_file: str) -> subprocess.Popen:
-    """Run a command in the background, redirecting output to a log file."""
+    On /dev/shm the log bytes are produced and consumed entirely in RAM,
+    so they never round-trip through disk between the children writing
+    them and check.py scanning them. Falls back to the working directory
+    on platforms without a tmpfs mount.
+    """
+    if os.path.isdir("/dev/shm"):
+        path = f"/dev/shm/dht-test-{os.getpid()}"
+        try:
+            os.makedirs(path, exist_ok=True)
+            return path
+        except OSError:
+            pass
+    return "."
+
+
+# Exported before the check import below so its module-level log paths
+# resolve to the same directory the children write into. A directory we
+# created ourselves is removed again on exit; one named by the caller
+# through DHT_LOG_DIR is left alone.
+if "DHT_LOG_DIR" in os.environ:
+    LOG_DIR = os.environ["DHT_LOG_DIR"]
+    _OWN_LOG_DIR = False
+else:
+    LOG_DIR = os.environ["DHT_LOG_DIR"] = _pick_log_dir()
+    _OWN_LOG_DIR = LOG_DIR != "."
+
+# Import the validator as a module so step 8 is a plain function call
+# instead of a second interpreter startup
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import check
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+
+def run_command_background(cmd: list, log_file: str, ready_marker: bytes = None):
+    """Run a command in the background, streaming output to a log file.
+
+    Output goes through a pipe and a reader thread that writes the log in
+    8 KiB chunks, so the harness can watch for a readiness marker as the
+    child produces it instead of polling the log file. Returns
+    (proc, ready_event); the event is None when no marker was requested.
+    """
     print(f"Running: {' '.join(cmd)} > {log_file}")
-    with open(log_file, 'w') as f:
-        proc = subprocess.Popen(
-            cmd,
-            stdout=f,
-            stderr=subprocess.STDOUT,
-            text=True
-        )
-    return proc
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=8192
+    )
+    ready_event = threading.Event() if ready_marker else None
+
+    def pump():
+        with open(log_file, 'wb') as log_fh:
+            # read1 returns whatever is available instead of blocking for
+            # a full 8 KiB, so markers are seen as soon as they are written
+            while chunk := proc.stdout.read1(8192):
+                log_fh.write(chunk)
+                log_fh.flush()
+                if ready_event and not ready_event.is_set() and ready_marker in chunk:
+                    ready_event.set()
+
+    threading.Thread(target=pump, daemon=True).start()
+    return proc, ready_event
 
 
 def wait_for_file(filepath: str, timeout: int = 10) -> bool:
-    """Wait for a file to exist and have content."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        print(f"Found content in {filepath}: {content}")
+    """Wait for a file to exist and have content.
+
+    Uses an inotify watch on the parent directory when available, so the
+    kernel wakes us the moment the writer closes the file instead of
+    paying up to 500 ms of polling latency; falls back to the polling
+    loop where inotify_simple is not installed.
+    """
+    deadline = time.time() + timeout
+
+    def has_content() -> bool:
+        try:
+            with open(filepath, 'r') as f:
+                content = f.read().strip()
+        except Exception:
+            return False
+        if content:
+            print(f"Found content in {filepath}: {content}")
+            return True
+        return False
+
+    if has_content():
+        return True
+
+    if INotify is not None:
+        inotify = INotify()
+        try:
+            watch_dir = os.path.dirname(filepath) or "."
+            target = os.path.basename(filepath)
+            inotify.add_watch(watch_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            # Re-check now that the watch is in place, closing the race
+            # where the file landed before add_watch
+            if has_content():
+                return True
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                for event in inotify.read(timeout=int(remaining * 1000)):
+                    if event.name == target and has_content():
                         return True
-            except Exception:
-                pass
+        finally:
+            inotify.close()
+
+    while time.time() < deadline:
+        if has_content():
+            return True
         time.sleep(0.5)
     return False
 
@@ -65,9 +160,11 @@ def main():
     
     try:
         # Clean up any existing log files
+        print(f"Logs will be written to: {LOG_DIR}")
         for log_file in ["server.log", "client.log", "checker.log"]:
-            if os.path.exists(log_file):
-                os.remove(log_file)
+            log_path = os.path.join(LOG_DIR, log_file)
+            if os.path.exists(log_path):
+                os.remove(log_path)
         
         # Remove any existing server address file
         for addr_file in ["server_node_addr.txt", "app/server_node_addr.txt"]:
@@ -75,13 +172,15 @@ def main():
                 os.remove(addr_file)
         
         print("1. Starting DHT server node...")
-        server_proc = run_command_background(
+        server_proc, server_ready = run_command_background(
             ["python", "app/main.py", "--mode", "server", "--port", "8000", "--verbose"],
-            "server.log"
+            os.path.join(LOG_DIR, "server.log"),
+            ready_marker=b"DHT service started"
         )
         
         # Wait for server to start and create address file
         print("2. Waiting for server to initialize...")
+        server_ready.wait(timeout=15)
         if not wait_for_file("app/server_node_addr.txt", timeout=15):
             print("X Server failed to start or create address file")
             return False
@@ -95,9 +194,9 @@ def main():
         time.sleep(2)
         
         print("4. Starting DHT client node...")
-        client_proc = run_command_background(
+        client_proc, _ = run_command_background(
             ["python", "app/main.py", "--mode", "client", "--bootstrap", server_addr, "--verbose"],
-            "client.log"
+            os.path.join(LOG_DIR, "client.log")
         )
         
         # Wait for client to connect
@@ -109,7 +208,7 @@ def main():
         env = os.environ.copy()
         env["REMOTE_PEERS"] = server_addr
         
-        with open("checker.log", 'w') as f:
+        with open(os.path.join(LOG_DIR, "checker.log"), 'w') as f:
             checker_result = subprocess.run(
                 ["python", "checker/checker.py"],
                 stdout=f,
@@ -124,21 +223,16 @@ def main():
         time.sleep(1)
         
         print("8. Running validation...")
-        check_result = subprocess.run(
-            ["python", "check.py"],
-            capture_output=True,
-            text=True
-        )
-        
+        # In-process call; capture the report so it still prints under the
+        # TEST RESULTS banner like the old subprocess output did
+        report = io.StringIO()
+        with contextlib.redirect_stdout(report):
+            success = check.main()
+
         print("\n" + "=" * 60)
         print("TEST RESULTS")
         print("=" * 60)
-        print(check_result.stdout)
-        if check_result.stderr:
-            print("STDERR:")
-            print(check_result.stderr)
-        
-        success = check_result.returncode == 0
+        print(report.getvalue())
         print(f"\n{'SUCCESS' if success else 'FAILED'}")
         return success
         
@@ -151,6 +245,11 @@ def main():
     finally:
         print("\n9. Cleaning up processes...")
         cleanup_processes(server_proc, client_proc)
+        if _OWN_LOG_DIR:
+            # The logs live in RAM-backed tmpfs; removing the per-run
+            # directory keeps repeated runs from accumulating there. Set
+            # DHT_LOG_DIR explicitly to keep the logs for inspection.
+            shutil.rmtree(LOG_DIR, ignore_errors=True)
         print("Cleanup complete")
 
 
@@ -5,10 +5,20 @@ Checks that all required Python packages and tools are available.
 """
 
 import sys
+import shutil
 import subprocess
 import importlib.util
-import pkg_resources
-from packaging import version
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version as package_version
+
+def _version_tuple(version_string):
+    """Turn '3.20.1' into (3, 20, 1), ignoring any non-numeric tail"""
+    parts = []
+    for part in version_string.split("."):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
 
 def check_python_version():
     """Check if Python version meets minimum requirements"""
@@ -35,41 +45,56 @@ def check_pip():
 
 def check_package(package_name, min_version=None):
     """Check if a Python package is installed with optional version check"""
+    # importlib.metadata reads just the one distribution's metadata instead
+    # of building pkg_resources' full working set at import time
     try:
         if min_version:
-            pkg_resources.require(f"{package_name}>={min_version}")
-            installed_version = pkg_resources.get_distribution(package_name).version
+            installed_version = package_version(package_name)
+            if _version_tuple(installed_version) < _version_tuple(min_version):
+                print(f"! {package_name} >= {min_version} is required")
+                return False
             print(f"v {package_name} {installed_version} is installed")
         else:
             importlib.import_module(package_name)
             try:
-                installed_version = pkg_resources.get_distribution(package_name).version
+                installed_version = package_version(package_name)
                 print(f"v {package_name} {installed_version} is installed")
-            except:
+            except PackageNotFoundError:
                 print(f"v {package_name} is installed")
         return True
-    except (ImportError, pkg_resources.DistributionNotFound, pkg_resources.VersionConflict):
+    except (ImportError, PackageNotFoundError):
         if min_version:
             print(f"! {package_name} >= {min_version} is required")
         else:
             print(f"! {package_name} is not installed")
         return False
 
-def check_command(command, description=None):
-    """Check if a system command is available"""
+# Sentinel distinguishing "not probed yet" from a failed probe
+_UNPROBED = object()
+
+def probe_command(command):
+    """Run `command --version`, returning None if it is missing or hangs"""
+    # which() short-circuits the fork+exec when the binary is not on PATH
+    if shutil.which(command) is None:
+        return None
     try:
-        result = subprocess.run([command, "--version"], 
-                                capture_output=True, text=True, timeout=5)
+        return subprocess.run([command, "--version"],
+                              capture_output=True, text=True, timeout=5)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+def check_command(command, description=None, probe=_UNPROBED):
+    """Check if a system command is available"""
+    result = probe_command(command) if probe is _UNPROBED else probe
+    if result is not None:
         if result.returncode == 0:
             print(f"v {command} is installed")
             return True
-        else:
-            print(f"! {command} is not available")
-            return False
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        desc = f" ({description})" if description else ""
-        print(f"! {command}{desc} is not installed")
+        print(f"! {command} is not available")
         return False
+    desc = f" ({description})" if description else ""
+    print(f"! {command}{desc} is not installed")
+    return False
 
 def install_instructions():
     """Print installation instructions for missing dependencies"""
@@ -112,12 +137,17 @@ def main():
         if not check_package(package, min_ver):
             all_dependencies_met = False
     
-    # Check system tools
+    # Check system tools, probing them concurrently: the --version forks
+    # are independent, so wall time is the slowest probe instead of the sum
     print("\nChecking system tools:")
-    if not check_command("git", "version control"):
+    tools = [("git", "version control"), ("docker", "containerization")]
+    with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+        probes = list(executor.map(probe_command, [command for command, _ in tools]))
+    
+    if not check_command("git", "version control", probes[0]):
         print("  (Git is recommended for cloning py-libp2p source)")
     
-    check_command("docker", "containerization")
+    check_command("docker", "containerization", probes[1])
     
     print("\n" + "="*70)
     if all_dependencies_met: